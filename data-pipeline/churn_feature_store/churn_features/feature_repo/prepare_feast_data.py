@@ -9,17 +9,20 @@ def prepare_data_for_feast(input_path, output_path="data/processed_churn_data.pa
     """
     Convert processed churn data to Feast-compatible format
     """
-    # Load your processed data
-    df = pd.read_csv(input_path)
+    # Load your processed data (Parquet from process_raw_data.py, CSV still accepted)
+    if str(input_path).endswith('.parquet'):
+        df = pd.read_parquet(input_path)
+    else:
+        df = pd.read_csv(input_path)
     
     # Add timestamp columns required by Feast
     current_time = datetime.now()
     
     # Create event timestamp (simulate data from last 90 days)
-    df['event_timestamp'] = current_time - pd.to_timedelta(
-        np.random.randint(0, 90 * 24 * 60 * 60, size=len(df)),
-        unit='s'
-    )
+    rng = np.random.default_rng(42)
+    offsets = rng.integers(0, 90 * 24 * 60 * 60, size=len(df), dtype=np.int32)
+    now_s = np.datetime64(current_time, 's')
+    df['event_timestamp'] = (now_s - offsets.astype('timedelta64[s]')).astype('datetime64[ns]')
     
     # Create created timestamp (when feature was computed)
     df['created_timestamp'] = current_time
@@ -96,6 +99,9 @@ def prepare_data_for_feast(input_path, output_path="data/processed_churn_data.pa
     return df_feast
 
 if __name__ == "__main__":
-    # Update this path to your processed data
-    input_file = "../../../data/processed/df_processed.csv"
+    # Update this path to your processed data. Falls back to the DVC-tracked
+    # df_processed.csv (dvc pull) until df_processed.parquet has been generated
+    input_file = "../../../data/processed/df_processed.parquet"
+    if not os.path.exists(input_file):
+        input_file = "../../../data/processed/df_processed.csv"
     prepare_data_for_feast(input_file)
\ No newline at end of file
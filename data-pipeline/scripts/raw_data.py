@@ -0,0 +1,53 @@
+"""
+Shared helpers for loading the raw churn CSVs and building ratio features.
+
+Used by process_raw_data.py (training data) and generate_test_parquet.py
+(test data) so both read and engineer the raw columns the same way.
+"""
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+# Explicit types for the raw numeric columns (float64, as pd.read_csv infers,
+# so the trained model's signature keeps double columns)
+RAW_COLUMN_TYPES = {
+    'CustomerID': pa.float64(),
+    'Age': pa.float64(),
+    'Tenure': pa.float64(),
+    'Usage Frequency': pa.float64(),
+    'Support Calls': pa.float64(),
+    'Payment Delay': pa.float64(),
+    'Total Spend': pa.float64(),
+    'Last Interaction': pa.float64(),
+}
+
+
+def read_raw_csv(input_path: str) -> pa.Table:
+    """
+    Load a raw churn CSV with the multi-threaded Arrow parser (8 MiB blocks).
+
+    Empty cells, including in string columns, are read as nulls like pd.read_csv.
+
+    Args:
+        input_path: Path to the raw CSV file
+
+    Returns:
+        Arrow table with RAW_COLUMN_TYPES applied
+    """
+    return pacsv.read_csv(
+        input_path,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20),
+        convert_options=pacsv.ConvertOptions(
+            column_types=RAW_COLUMN_TYPES,
+            strings_can_be_null=True,
+        ),
+    )
+
+
+def safe_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """
+    Compute numerator / max(denominator, 1) using a single output buffer.
+    """
+    out = np.maximum(denominator, 1)
+    np.divide(numerator, out, out=out)
+    return out
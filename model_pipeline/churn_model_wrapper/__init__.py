@@ -0,0 +1,9 @@
+"""
+Prediction wrapper shipped with logged models as MLflow code_paths.
+
+Kept as its own top-level package (outside src) so that loading a model
+never shadows the repo's src package.
+"""
+from churn_model_wrapper.classifier_wrapper import BinaryClassifierWrapper
+
+__all__ = ['BinaryClassifierWrapper']
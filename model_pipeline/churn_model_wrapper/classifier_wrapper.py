@@ -0,0 +1,98 @@
+"""
+BinaryClassifierWrapper, the pyfunc wrapper logged with every trained model
+"""
+import mlflow
+import numpy as np
+import pandas as pd
+
+
+def _check_unseen_labels(col, values, encoded):
+    """Raise like LabelEncoder when a non-null input has no encoding"""
+    unseen = encoded.isna() & values.notna()
+    if unseen.any():
+        labels = sorted(set(values[unseen].astype(str)))
+        raise ValueError(f"Column {col!r} contains previously unseen labels: {labels}")
+
+
+class BinaryClassifierWrapper(mlflow.pyfunc.PythonModel):  #type:ignore
+    """Generic wrapper for binary classification models"""
+    
+    def __init__(
+        self,
+        model,
+        model_type,
+        feature_names,
+        label_encoder=None,
+        feature_encoders=None,
+        category_dtypes=None,
+    ):
+        self.model = model
+        self.model_type = model_type
+        self.feature_names = feature_names
+        self.label_encoder = label_encoder
+        self.feature_encoders = feature_encoders or {}
+        # Training-time categories for columns the model consumes natively (XGBoost)
+        self.category_dtypes = category_dtypes or {}
+        # Precomputed label -> code lookups, applied with a hash-table Series.map
+        self._encoding_maps = {
+            col: dict(zip(
+                encoder.classes_.astype(str),
+                range(len(encoder.classes_)),
+                strict=True,
+            ))
+            for col, encoder in self.feature_encoders.items()
+        }
+
+    def predict(self, context, model_input, params=None):  #type:ignore
+        # Only copy when columns are about to be replaced. A shallow copy is
+        # enough: assigning a column swaps it in the copy, leaving model_input intact
+        if self._encoding_maps or self.category_dtypes:
+            df = model_input.copy(deep=False)
+        else:
+            df = model_input
+
+        for col, mapping in self._encoding_maps.items():
+            if col in df.columns:
+                encoded = df[col].astype(str).map(mapping)
+                _check_unseen_labels(col, df[col], encoded)
+                df[col] = encoded.astype('int32')
+
+        for col, dtype in self.category_dtypes.items():
+            if col in df.columns:
+                # Casting to the training categories turns unseen labels into NaN
+                encoded = df[col].astype(dtype)
+                _check_unseen_labels(col, df[col], encoded)
+                df[col] = encoded
+        
+        X = df[self.feature_names]
+        if self.model_type == 'xgboost' and not self.category_dtypes:
+            # XGBoost works in float32; hand it a contiguous float32 buffer
+            # instead of letting it unify DataFrame dtypes on every call
+            X = X.to_numpy(dtype=np.float32)
+        
+        probs = self.model.predict_proba(X)[:, 1]
+        
+        
+        if params is None:
+            params = {}
+        
+        return_probs = params.get('return_probs', False)
+        return_both = params.get('return_both', False)
+
+        binary_preds = (probs >= 0.5).astype(int)
+        if self.label_encoder is not None:
+            final_preds = self.label_encoder.inverse_transform(binary_preds)
+        else:
+            final_preds = binary_preds
+
+        max_probs = np.maximum(probs, 1 - probs)
+        
+        if return_both:
+            return pd.DataFrame({
+                'probability': max_probs,
+                'prediction': final_preds
+            })
+        elif return_probs:
+            return max_probs
+        else:
+            return final_preds
@@ -1,40 +1,132 @@
 """
 Docstring for model_pipelinene.src.mlflow_utils.model_registry
 """
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from cachetools import TTLCache
 from mlflow import MlflowClient
+from mlflow.entities import ViewType
 from mlflow.entities.model_registry import ModelVersion
+from mlflow.exceptions import MlflowException
 from loguru import logger
+from typing import Iterator
 import mlflow
 
+# get_model_info version field -> ModelVersion attribute
+VERSION_INFO_FIELDS = {
+    "version": "version",
+    "stage": "current_stage",
+    "status": "status",
+    "run_id": "run_id",
+    "creation_timestamp": "creation_timestamp",
+}
+
 class ModelRegistry:
     def __init__(self, tracking_uri: str):
         self.client = MlflowClient(tracking_uri=tracking_uri)
         mlflow.set_tracking_uri(tracking_uri)
-        logger.info(f"Initialized Model Registry: {tracking_uri}")
+        # Registered model names already confirmed to exist on the server
+        self._known_models: set[str] = set()
+        # Short-lived caches for registry reads; entries are dropped whenever this
+        # registry mutates the alias/versions they describe
+        self._cache_lock = Lock()
+        self._alias_cache: TTLCache = TTLCache(maxsize=256, ttl=60)
+        self._latest_versions_cache: TTLCache = TTLCache(maxsize=256, ttl=60)
+        logger.info("Initialized Model Registry: {}", tracking_uri)
+
+
+    def _invalidate_cached_versions(
+        self,
+        model_name: str,
+        alias: str | None = None,
+    ):
+        with self._cache_lock:
+            if alias is not None:
+                self._alias_cache.pop((model_name, alias), None)
+                return
+            for cache in (self._alias_cache, self._latest_versions_cache):
+                for key in [key for key in cache if key[0] == model_name]:
+                    cache.pop(key, None)
+
+    def _active_experiment_ids(self) -> list[str]:
+        # search_experiments returns one page at a time, follow the tokens
+        experiment_ids = []
+        page_token = None
+        while True:
+            experiments = self.client.search_experiments(
+                view_type=ViewType.ACTIVE_ONLY,
+                page_token=page_token,
+            )
+            experiment_ids.extend(exp.experiment_id for exp in experiments)
+            page_token = experiments.token
+            if not page_token:
+                return experiment_ids
+
+    def _latest_eval_metric(
+        self,
+        experiment_ids: list[str],
+        run_id: str,
+        metric: str
+    ):
+        # Let the tracking store filter, sort and limit instead of pulling every run
+        runs = self.client.search_runs(
+            experiment_ids=experiment_ids,
+            filter_string=(
+                f"tags.source_run_id = '{run_id}' and attributes.status = 'FINISHED'"
+            ),
+            run_view_type=ViewType.ACTIVE_ONLY,
+            max_results=1,
+            order_by=["attributes.end_time DESC"],
+        )
+        if not runs:
+            logger.warning("No finished evaluation run found for run {}", run_id)
+            return None
+
+        return runs[0].data.metrics.get(metric)
+
+    def _find_alias_holder(self, alias: str) -> ModelVersion | None:
+        """
+        Find the model version holding an alias across all registered models
+
+        Registered models carry their alias -> version map, so this pages
+        through models instead of fetching every version.
+
+        Args:
+            alias: Alias name
 
+        Returns:
+            ModelVersion holding the alias, or None if no model uses it
+        """
+        page_token = None
+        while True:
+            models = self.client.search_registered_models(page_token=page_token)
+            for model in models:
+                if alias in model.aliases:
+                    return self.client.get_model_version(
+                        name=model.name,
+                        version=model.aliases[alias],
+                    )
+            page_token = models.token
+            if not page_token:
+                return None
 
     def retrieve_eval_metrics_based_on_run_id(
         self,
         run_id: str,
         metric: str
     ):
-        all_experiments = mlflow.search_runs(search_all_experiments=True)
-        print(all_experiments)
-        evaluation = all_experiments[ #type:ignore
-            (all_experiments["tags.source_run_id"] == f"{run_id}") & #type:ignore
-            (all_experiments["status"] == "FINISHED") #type:ignore
-        ]
-
-        latest_eval = evaluation.sort_values(
-            by="end_time",
-            ascending=False
-        ).head(1)
-
-        eval_run_id = latest_eval['run_id'].values.tolist()[0]
-        eval_run = self.client.get_run(eval_run_id)
-
-        return eval_run.data.metrics[metric]
-    
+        """
+        Get a metric from the latest finished evaluation run of a training run
+
+        Args:
+            run_id: Training run ID referenced by the eval run's source_run_id tag
+            metric: Metric name
+
+        Returns:
+            Metric value, or None if no evaluation run or metric is found
+        """
+        return self._latest_eval_metric(self._active_experiment_ids(), run_id, metric)
+
     def register_model(
         self,
         model_uri: str,
@@ -54,35 +146,32 @@ class ModelRegistry:
             ModelVersion object
         """
 
-        logger.info(f"Registering model: {model_name}")
-        logger.info(f"Model URI: {model_uri}")
+        logger.info("Registering model: {}", model_name)
+        logger.info("Model URI: {}", model_uri)
 
-        try:
-            self.client.get_registered_model(model_name)
-        except Exception:
-            logger.info(f"Registered model '{model_name}' not found. Creating it.")
-            self.client.create_registered_model(
-                name=model_name,
-                description=description,
-            )
+        if model_name not in self._known_models:
+            # Create directly and treat "already exists" as success: one call, no probe
+            try:
+                self.client.create_registered_model(
+                    name=model_name,
+                    description=description,
+                )
+                logger.info("Created registered model '{}'", model_name)
+            except MlflowException as e:
+                if e.error_code != "RESOURCE_ALREADY_EXISTS":
+                    raise
+            self._known_models.add(model_name)
 
         model_version = self.client.create_model_version(
             name=model_name,
             source=model_uri,
             run_id=model_uri.split("/")[1] if "runs:" in model_uri else None,
+            tags=tags,
             description=description,
         )
 
-        if tags:
-            for key, val in tags.items():
-                self.client.set_model_version_tag(
-                    name=model_name,
-                    version=model_version.version,
-                    key=key,
-                    value=val
-                )
-        
-        logger.info(f"Model registered: {model_name} v{model_version.version}")
+        self._invalidate_cached_versions(model_name)
+        logger.info("Model registered: {} v{}", model_name, model_version.version)
         return model_version
     
 
@@ -101,8 +190,11 @@ class ModelRegistry:
                 tags=tags,
                 description=description
             )
-        except Exception as e:
-            logger.warning(f"Model {name=} may already exist: {e}")
+        except MlflowException as e:
+            if e.error_code != "RESOURCE_ALREADY_EXISTS":
+                raise
+            logger.warning("Model name={!r} already exists", name)
+        self._known_models.add(name)
         
     def set_model_version_alias(
         self,
@@ -116,15 +208,16 @@ class ModelRegistry:
         Args:
             alias: Alias name (e.g., "champion", "staging", "production")
         """
-        logger.info(f"Setting alias '{alias}' for {model_name} v{version}")
+        logger.info("Setting alias '{}' for {} v{}", alias, model_name, version)
         
         self.client.set_registered_model_alias(
             name=model_name,
             alias=alias,
             version=version,
         )
+        self._invalidate_cached_versions(model_name, alias=alias)
         
-        logger.info(f"Alias set: {model_name}@{alias} -> v{version}")
+        logger.info("Alias set: {}@{} -> v{}", model_name, alias, version)
 
     def delete_model_version_alias(
         self,
@@ -142,7 +235,8 @@ class ModelRegistry:
             name=model_name,
             alias=alias,
         )
-        logger.info(f"Deleted alias: {model_name}@{alias}")
+        self._invalidate_cached_versions(model_name, alias=alias)
+        logger.info("Deleted alias: {}@{}", model_name, alias)
     
     def get_model_version_by_alias(
         self,
@@ -157,12 +251,21 @@ class ModelRegistry:
             alias: Alias name
             
         Returns:
-            ModelVersion object
+            ModelVersion object (cached for up to 60s)
         """
-        return self.client.get_model_version_by_alias(
+        key = (model_name, alias)
+        with self._cache_lock:
+            cached = self._alias_cache.get(key)
+        if cached is not None:
+            return cached
+
+        model_version = self.client.get_model_version_by_alias(
             name=model_name,
             alias=alias,
         )
+        with self._cache_lock:
+            self._alias_cache[key] = model_version
+        return model_version
 
     def get_latest_versions(
         self,
@@ -177,12 +280,21 @@ class ModelRegistry:
             stages: List of stages to filter (None = all stages)
             
         Returns:
-            List of ModelVersion objects
+            List of ModelVersion objects (cached for up to 60s)
         """
-        return self.client.get_latest_versions(
+        key = (model_name, tuple(stages or ()))
+        with self._cache_lock:
+            cached = self._latest_versions_cache.get(key)
+        if cached is not None:
+            return cached
+
+        versions = self.client.get_latest_versions(
             name=model_name,
             stages=stages,
         )
+        with self._cache_lock:
+            self._latest_versions_cache[key] = versions
+        return versions
     
     def search_model_versions(
         self,
@@ -221,7 +333,10 @@ class ModelRegistry:
             archive_existing_versions: Archive other versions in target stage
         """
         logger.info(
-            f"Transitioning {model_name} v{version} to {stage}"
+            "Transitioning {} v{} to {}",
+            model_name,
+            version,
+            stage,
         )
         
         self.client.transition_model_version_stage(
@@ -230,8 +345,9 @@ class ModelRegistry:
             stage=stage,
             archive_existing_versions=archive_existing_versions,
         )
+        self._invalidate_cached_versions(model_name)
         
-        logger.info(f"Model transitioned to {stage}")
+        logger.info("Model transitioned to {}", stage)
 
     def delete_model_version(
         self,
@@ -249,39 +365,99 @@ class ModelRegistry:
             name=model_name,
             version=version,
         )
-        logger.info(f"Deleted {model_name} v{version}")
+        self._invalidate_cached_versions(model_name)
+        logger.info("Deleted {} v{}", model_name, version)
     
+    def _iter_model_version_pages(
+        self,
+        model_name: str,
+        page_size: int,
+        order_by: list[str] | None = None,
+    ) -> Iterator[list[ModelVersion]]:
+        page_token = None
+        while True:
+            page = self.client.search_model_versions(
+                filter_string=f"name='{model_name}'",
+                max_results=page_size,
+                order_by=order_by,
+                page_token=page_token,
+            )
+            yield page
+            page_token = page.token
+            if not page_token:
+                break
+
+    def _iter_model_versions(
+        self,
+        model_name: str,
+        fields: list[str],
+        page_size: int,
+    ) -> Iterator[dict]:
+        # Page through versions newest first, projecting only the requested fields
+        pages = self._iter_model_version_pages(
+            model_name,
+            page_size=page_size,
+            order_by=["creation_timestamp DESC"],
+        )
+        for page in pages:
+            for v in page:
+                yield {field: getattr(v, VERSION_INFO_FIELDS[field]) for field in fields}
+
+    def count_model_versions(
+        self,
+        model_name: str,
+        page_size: int = 1000,
+    ) -> int:
+        """
+        Count versions of a registered model
+        
+        Args:
+            model_name: Name of registered model
+            page_size: Versions fetched per registry request
+            
+        Returns:
+            Number of model versions
+        """
+        # The registry exposes no total, so page with a large size and count
+        return sum(
+            len(page)
+            for page in self._iter_model_version_pages(model_name, page_size=page_size)
+        )
+
     def get_model_info(
         self,
         model_name: str,
+        fields: list[str] | None = None,
+        page_size: int = 100,
     ) -> dict:
         """
         Get model information including all versions
         
         Args:
             model_name: Name of registered model
+            fields: Version fields to include (default: all of VERSION_INFO_FIELDS)
+            page_size: Versions fetched per registry request
             
         Returns:
-            Dictionary with model info
+            Dictionary with model info; "versions" is a lazy iterator of dicts,
+            newest version first
         """
+        unknown = set(fields or ()) - VERSION_INFO_FIELDS.keys()
+        if unknown:
+            raise ValueError(f"Unknown version fields: {sorted(unknown)}")
+
         model = self.client.get_registered_model(model_name)
-        versions = self.client.search_model_versions(f"name='{model_name}'")
         
         info = {
             "name": model.name,
             "description": model.description,
             "creation_timestamp": model.creation_timestamp,
             "last_updated_timestamp": model.last_updated_timestamp,
-            "versions": [
-                {
-                    "version": v.version,
-                    "stage": v.current_stage,
-                    "status": v.status,
-                    "run_id": v.run_id,
-                    "creation_timestamp": v.creation_timestamp,
-                }
-                for v in versions
-            ],
+            "versions": self._iter_model_versions(
+                model_name,
+                fields=fields or list(VERSION_INFO_FIELDS),
+                page_size=page_size,
+            ),
         }
         
         return info
@@ -302,6 +478,7 @@ class ModelRegistry:
         to_alias: str = "champion",
         metric_name: str = "f1_score",
         require_improvement: bool = True,
+        stage: str | None = None,
     ):
         """
         Promote a model from staging to production
@@ -311,94 +488,125 @@ class ModelRegistry:
             version: Version to promote
             from_alias: Source alias
             to_alias: Target alias
+            stage: When version is None, pick the latest version in this stage
+                instead of the newest version overall
         """
-        logger.info(f"Promoting {model_name} v{version} as global {to_alias}")
+        logger.info("Promoting {} v{} as global {}", model_name, version, to_alias)
         
         if version is None:
-            logger.info(f"No version specified, selecting latest version of {model_name}")
-            versions = self.get_latest_versions(model_name=model_name)
+            logger.info("No version specified, selecting latest version of {}", model_name)
+            if stage is not None:
+                versions = self.get_latest_versions(model_name=model_name, stages=[stage])
+            else:
+                # Let the registry order by version number and return only the newest
+                versions = self.client.search_model_versions(
+                    filter_string=f"name='{model_name}'",
+                    max_results=1,
+                    order_by=["version_number DESC"],
+                )
             if not versions:
-                logger.error(f"No versions found for model {model_name}")
+                logger.error("No versions found for model {}", model_name)
                 return False
-            version = max(versions, key=lambda v: int(v.version)).version
-            logger.info(f"Using latest version: v{version}")
+            version = versions[0].version
+            logger.info("Using latest version: v{}", version)
 
         candidate = self.client.get_model_version(
             name=model_name,
             version=version
         )
-        candidate_metric = self.retrieve_eval_metrics_based_on_run_id(
-            run_id=candidate.run_id,  # type: ignore
-            metric=metric_name,
+        # List experiments once and share it between both metric lookups
+        experiment_ids = self._active_experiment_ids()
+        candidate_metric = self._latest_eval_metric(
+            experiment_ids,
+            candidate.run_id,  # type: ignore
+            metric_name,
         )
 
         if candidate_metric is None:
             logger.error(
-                f"Candidate {model_name} v{version} missing metric '{metric_name}'. Aborting."
+                "Candidate {} v{} missing metric '{}'. Aborting.",
+                model_name,
+                version,
+                metric_name,
             )
             return False
         
         logger.info(
-            f"Candidate {model_name} v{version} {metric_name}: {candidate_metric:.4f}"
+            "Candidate {} v{} {}: {:.4f}",
+            model_name,
+            version,
+            metric_name,
+            candidate_metric,
         )
 
-        current_champion = None
+        current_champion = self._find_alias_holder(to_alias)
 
-        for mv in self.search_model_versions():
-            mv_details = self.client.get_model_version(
-                name=mv.name,
-                version=mv.version,
-            )
-            if mv_details.aliases and to_alias in mv_details.aliases:
-                current_champion = mv_details
-                break
-                
         if current_champion:
             logger.info(
-            f"Current champion: {current_champion.name} v{current_champion.version}"
+                "Current champion: {} v{}",
+                current_champion.name,
+                current_champion.version,
             )
 
-            champion_metric = self.retrieve_eval_metrics_based_on_run_id(
-                run_id=current_champion.run_id,  # type: ignore
-                metric=metric_name,
+            champion_metric = self._latest_eval_metric(
+                experiment_ids,
+                current_champion.run_id,  # type: ignore
+                metric_name,
             )
 
             if champion_metric is None:
                 logger.warning(
-                    f"Current champion missing '{metric_name}'. Proceeding with promotion."
+                    "Current champion missing '{}'. Proceeding with promotion.",
+                    metric_name,
                 )
             else:
                 logger.info(
-                    f"Current champion {metric_name}: {champion_metric:.4f}"
+                    "Current champion {}: {:.4f}",
+                    metric_name,
+                    champion_metric,
                 )
 
                 if require_improvement and candidate_metric <= champion_metric:
                     logger.error(
-                        f"Promotion blocked: candidate does not improve {metric_name} "
-                        f"({candidate_metric:.4f} <= {champion_metric:.4f})"
+                        "Promotion blocked: candidate does not improve {} "
+                        "({:.4f} <= {:.4f})",
+                        metric_name,
+                        candidate_metric,
+                        champion_metric,
                     )
                     return False
                 improvement = candidate_metric - champion_metric
                 logger.info(
-                    f"Candidate improves {metric_name} by {improvement:+.4f}"
+                    "Candidate improves {} by {:+.4f}",
+                    metric_name,
+                    improvement,
                 )
             
-            self.delete_model_version_alias(
-                model_name=current_champion.name,
-                alias=to_alias,
-            )
-            
         else:
             logger.info("No existing global champion found")
         
-
-        try:
-            self.delete_model_version_alias(
+        # The two alias deletes are independent REST calls, run them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            champion_delete = None
+            if current_champion:
+                champion_delete = executor.submit(
+                    self.delete_model_version_alias,
+                    model_name=current_champion.name,
+                    alias=to_alias,
+                )
+            from_alias_delete = executor.submit(
+                self.delete_model_version_alias,
                 model_name=model_name,
                 alias=from_alias,
             )
+
+        if champion_delete is not None:
+            champion_delete.result()
+
+        try:
+            from_alias_delete.result()
         except Exception:
-            logger.info(f"No '{from_alias}' alias to clear for {model_name} v{version}")
+            logger.info("No '{}' alias to clear for {} v{}", from_alias, model_name, version)
         
         self.set_model_version_alias(
             model_name=model_name,
@@ -406,6 +614,8 @@ class ModelRegistry:
             alias=to_alias,
         )
         logger.success(
-            f"Global champion is now {model_name} v{version}"
+            "Global champion is now {} v{}",
+            model_name,
+            version,
         )
         return True
\ No newline at end of file
@@ -6,7 +6,6 @@ import mlflow
 from mlflow.models import infer_signature
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.linear_model import LogisticRegression
@@ -14,54 +13,42 @@ from xgboost import XGBClassifier
 from loguru import logger
 
 from src.mlflow_utils.experiment_tracker import ExperimentTracker
-
-
-class BinaryClassifierWrapper(mlflow.pyfunc.PythonModel):  #type:ignore
-    """Generic wrapper for binary classification models"""
-    
-    def __init__(self, model, model_type, feature_names, label_encoder=None, feature_encoders=None):
-        self.model = model
-        self.model_type = model_type
-        self.feature_names = feature_names
-        self.label_encoder = label_encoder
-        self.feature_encoders = feature_encoders or {}
-
-    def predict(self, context, model_input, params=None):  #type:ignore
-        df = model_input.copy()
-
-        for col, encoder in self.feature_encoders.items():
-            if col in df.columns:
-                df[col] = encoder.transform(df[col].astype(str))
-        
-        X = df[self.feature_names]
-        
-        
-        probs = self.model.predict_proba(X)[:, 1]
-        
-        
-        if params is None:
-            params = {}
-        
-        return_probs = params.get('return_probs', False)
-        return_both = params.get('return_both', False)
-
-        binary_preds = (probs >= 0.5).astype(int)
-        if self.label_encoder is not None:
-            final_preds = self.label_encoder.inverse_transform(binary_preds)
-        else:
-            final_preds = binary_preds
-
-        max_probs = np.maximum(probs, 1 - probs)
-        
-        if return_both:
-            return pd.DataFrame({
-                'probability': max_probs,
-                'prediction': final_preds
-            })
-        elif return_probs:
-            return max_probs
-        else:
-            return final_preds
+import churn_model_wrapper
+from churn_model_wrapper import BinaryClassifierWrapper
+
+
+def _stratified_split_indices(
+    y: np.ndarray,
+    test_size: float,
+    random_state: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Stratified train/test split computed on row positions only
+
+    Args:
+        y: Target values
+        test_size: Fraction of each class assigned to the test set
+        random_state: Seed for the shuffle
+
+    Returns:
+        (train_positions, test_positions)
+    """
+    rng = np.random.default_rng(random_state)
+    _, class_ids = np.unique(y, return_inverse=True)
+
+    train_parts, test_parts = [], []
+    for cls in range(class_ids.max() + 1):
+        positions = np.flatnonzero(class_ids == cls)
+        rng.shuffle(positions)
+        n_test = int(round(len(positions) * test_size))
+        test_parts.append(positions[:n_test])
+        train_parts.append(positions[n_test:])
+
+    train_idx = np.concatenate(train_parts)
+    test_idx = np.concatenate(test_parts)
+    rng.shuffle(train_idx)
+    rng.shuffle(test_idx)
+    return train_idx, test_idx
 
 
 class GenericBinaryClassifierTrainer:
@@ -91,6 +78,7 @@ class GenericBinaryClassifierTrainer:
         self.model_type = model_type
         self.model = None
         self.feature_names = None
+        self.category_dtypes = {}
     
     def prepare_data(
         self,
@@ -109,9 +97,19 @@ class GenericBinaryClassifierTrainer:
         X = data[feature_cols]
         y = data[target_col]
 
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=random_state, stratify=y
+        if self.model_type == 'xgboost':
+            # XGBoost builds its histogram sketch from pandas categoricals
+            # directly, so string features skip Python-side label encoding
+            cat_cols = X.select_dtypes(include=['object', 'string', 'category']).columns
+            if len(cat_cols):
+                X = X.astype({col: 'category' for col in cat_cols})
+                self.category_dtypes = {col: X[col].dtype for col in cat_cols}
+
+        train_idx, test_idx = _stratified_split_indices(
+            y.to_numpy(), test_size=test_size, random_state=random_state
         )
+        X_train, X_test = X.take(train_idx), X.take(test_idx)
+        y_train, y_test = y.take(train_idx), y.take(test_idx)
 
         logger.info(f"Training set: {X_train.shape}, Test set: {X_test.shape}")
         logger.info(f"Class distribution - Train: {y_train.value_counts().to_dict()}")
@@ -148,11 +146,19 @@ class GenericBinaryClassifierTrainer:
         if self.feature_names is None:
             raise ValueError("Please prepare the data before training")
 
-        mlflow.sklearn.autolog(log_models=False) #type:ignore
+        # save_model infers the signature and logs the input example itself
+        mlflow.sklearn.autolog( #type:ignore
+            log_models=False,
+            log_input_examples=False,
+            log_model_signatures=False,
+        )
     
         model_class = self.SUPPORTED_MODELS[self.model_type]
   
         
+        if self.category_dtypes:
+            params = {**params, 'enable_categorical': True}
+
         self.model = model_class(**params)
         self.model.fit(X_train, y_train)
         
@@ -167,6 +173,9 @@ class GenericBinaryClassifierTrainer:
         self.tracker.log_metric("train_accuracy", train_score)
         self.tracker.log_metric("test_accuracy", test_score)
         
+        # Feature list as one JSON artifact: a single upload regardless of
+        # feature count and no 500-char param truncation
+        self.tracker.log_dict({"features": list(self.feature_names)}, "features.json")
 
         self._log_feature_importance()
         
@@ -190,8 +199,10 @@ class GenericBinaryClassifierTrainer:
                 reverse=True
             )[:10]
             
-            for feature, score in sorted_importance:
-                self.tracker.log_metric(f"feature_importance/{feature}", score)  #type:ignore
+            self.tracker.log_metrics({
+                f"feature_importance/{feature}": float(score)
+                for feature, score in sorted_importance
+            })
             logger.info("Feature importance logged")
     
     def save_model(
@@ -210,22 +221,24 @@ class GenericBinaryClassifierTrainer:
             model_type=self.model_type,
             feature_names=self.feature_names,
             label_encoder=label_encoder,
-            feature_encoders=feature_encoders
+            feature_encoders=feature_encoders,
+            category_dtypes=self.category_dtypes
         )
 
-        prediction = wrapper.predict(context=None, model_input=input_example)
-        signature = infer_signature(input_example, prediction)
-        
-        SRC_PATH = Path(__file__).resolve().parents[2]
-        logger.info(f"{SRC_PATH=}")
+        # Infer the signature from the same small slice that is logged as the example
+        sample = input_example.iloc[:3]
+        prediction = wrapper.predict(context=None, model_input=sample)
+        signature = infer_signature(sample, prediction)
         
         logger.info(f"Saving {self.model_type} model as '{model_name}'...")
+        # Ship only the wrapper package; it lives outside src so the model's
+        # code directory cannot shadow the repo's src package when loaded
         mlflow.pyfunc.log_model(
             python_model=wrapper,
             artifact_path=model_name,
             signature=signature,
-            input_example=input_example.iloc[:3],
-            code_paths=[str(SRC_PATH / 'src')]
+            input_example=sample,
+            code_paths=[str(Path(churn_model_wrapper.__file__).parent)]
         )
     
     # def load_model(self, model_uri: str):
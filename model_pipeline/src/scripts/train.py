@@ -91,8 +91,13 @@ def main():
     target_col = config["features"]["target_column"]
     feature_cols = config["features"]["training_features"]
 
+    # XGBoost handles categorical features natively (see trainer.prepare_data)
+    native_categorical = config['model']['model_type'] == 'xgboost'
+
     cols_to_encode = data.select_dtypes(include=['object', 'category']).columns.tolist()
     for col in cols_to_encode:
+        if native_categorical and col != target_col:
+            continue
         logger.info(f"Encoding column: {col}")
         le = LabelEncoder()
         data[col] = le.fit_transform(data[col].astype(str))
@@ -0,0 +1,115 @@
+from unittest.mock import Mock
+
+import mlflow
+import pytest
+
+from src.mlflow_utils.model_registry import ModelRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """ModelRegistry backed by a local sqlite tracking store"""
+    tracking_uri = f"sqlite:///{tmp_path}/mlflow.db"
+    yield ModelRegistry(tracking_uri=tracking_uri)
+    mlflow.set_tracking_uri(None)
+
+
+@pytest.fixture
+def experiment_id(registry, tmp_path):
+    return mlflow.create_experiment(
+        "registry_tests", artifact_location=str(tmp_path / "artifacts")
+    )
+
+
+def _log_training_and_eval(experiment_id, f1_score):
+    """Log a training run plus an evaluation run that references it"""
+    with mlflow.start_run(experiment_id=experiment_id) as train_run:
+        mlflow.log_param("model_type", "xgboost")
+    with mlflow.start_run(
+        experiment_id=experiment_id,
+        tags={"source_run_id": train_run.info.run_id},
+    ):
+        mlflow.log_metric("f1_score", f1_score)
+    return train_run.info.run_id
+
+
+def _spy(registry, method_name):
+    """Wrap a client method so its calls can be counted"""
+    spy = Mock(wraps=getattr(registry.client, method_name))
+    setattr(registry.client, method_name, spy)
+    return spy
+
+
+class TestCountModelVersions:
+
+    def test_counts_across_pages(self, registry, experiment_id):
+        run_id = _log_training_and_eval(experiment_id, 0.5)
+        for _ in range(5):
+            registry.register_model(f"runs:/{run_id}/model", "churn_model")
+
+        assert registry.count_model_versions("churn_model") == 5
+        assert registry.count_model_versions("churn_model", page_size=2) == 5
+
+    def test_unknown_model_has_no_versions(self, registry):
+        assert registry.count_model_versions("missing_model") == 0
+
+
+class TestRegistryCaches:
+
+    def test_alias_lookup_is_cached(self, registry, experiment_id):
+        run_id = _log_training_and_eval(experiment_id, 0.5)
+        version = registry.register_model(f"runs:/{run_id}/model", "churn_model")
+        registry.set_model_version_alias("churn_model", version.version, "staging")
+        spy = _spy(registry, "get_model_version_by_alias")
+
+        first = registry.get_model_version_by_alias("churn_model", "staging")
+        second = registry.get_model_version_by_alias("churn_model", "staging")
+
+        assert first.version == second.version == version.version
+        assert spy.call_count == 1
+
+    def test_set_alias_invalidates_alias_cache(self, registry, experiment_id):
+        run_id = _log_training_and_eval(experiment_id, 0.5)
+        v1 = registry.register_model(f"runs:/{run_id}/model", "churn_model")
+        v2 = registry.register_model(f"runs:/{run_id}/model", "churn_model")
+        registry.set_model_version_alias("churn_model", v1.version, "staging")
+        assert registry.get_model_version_by_alias("churn_model", "staging").version == v1.version
+
+        registry.set_model_version_alias("churn_model", v2.version, "staging")
+
+        assert registry.get_model_version_by_alias("churn_model", "staging").version == v2.version
+
+    def test_register_model_invalidates_latest_versions(self, registry, experiment_id):
+        run_id = _log_training_and_eval(experiment_id, 0.5)
+        v1 = registry.register_model(f"runs:/{run_id}/model", "churn_model")
+        assert [v.version for v in registry.get_latest_versions("churn_model")] == [v1.version]
+
+        v2 = registry.register_model(f"runs:/{run_id}/model", "churn_model")
+
+        assert [v.version for v in registry.get_latest_versions("churn_model")] == [v2.version]
+
+    def test_promote_model_invalidates_alias_cache(self, registry, experiment_id):
+        v1 = registry.register_model(
+            f"runs:/{_log_training_and_eval(experiment_id, 0.5)}/model", "churn_model"
+        )
+        assert registry.promote_model("churn_model", v1.version) is True
+        assert registry.get_model_version_by_alias("churn_model", "champion").version == v1.version
+
+        v2 = registry.register_model(
+            f"runs:/{_log_training_and_eval(experiment_id, 0.7)}/model", "churn_model"
+        )
+        assert registry.promote_model("churn_model", v2.version) is True
+
+        assert registry.get_model_version_by_alias("churn_model", "champion").version == v2.version
+
+    def test_rejected_promotion_keeps_champion(self, registry, experiment_id):
+        v1 = registry.register_model(
+            f"runs:/{_log_training_and_eval(experiment_id, 0.7)}/model", "churn_model"
+        )
+        registry.promote_model("churn_model", v1.version)
+        v2 = registry.register_model(
+            f"runs:/{_log_training_and_eval(experiment_id, 0.5)}/model", "churn_model"
+        )
+
+        assert registry.promote_model("churn_model", v2.version) is False
+        assert registry.get_model_version_by_alias("churn_model", "champion").version == v1.version
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from src.model.xgboost_trainer import _stratified_split_indices
+
+
+@pytest.fixture
+def imbalanced_target():
+    # 30% positive class, in a fixed order so the split has to shuffle
+    return np.array([0] * 700 + [1] * 300)
+
+
+class TestStratifiedSplitIndices:
+
+    def test_preserves_class_proportions(self, imbalanced_target):
+        train_idx, test_idx = _stratified_split_indices(
+            imbalanced_target, test_size=0.2, random_state=42
+        )
+
+        assert len(test_idx) == 200
+        assert len(train_idx) == 800
+        assert imbalanced_target[test_idx].mean() == pytest.approx(0.3)
+        assert imbalanced_target[train_idx].mean() == pytest.approx(0.3)
+
+    def test_partitions_all_rows(self, imbalanced_target):
+        train_idx, test_idx = _stratified_split_indices(
+            imbalanced_target, test_size=0.2, random_state=42
+        )
+
+        assert np.intersect1d(train_idx, test_idx).size == 0
+        np.testing.assert_array_equal(
+            np.sort(np.concatenate([train_idx, test_idx])),
+            np.arange(len(imbalanced_target)),
+        )
+
+    def test_same_seed_is_reproducible(self, imbalanced_target):
+        first = _stratified_split_indices(imbalanced_target, 0.2, random_state=7)
+        second = _stratified_split_indices(imbalanced_target, 0.2, random_state=7)
+
+        np.testing.assert_array_equal(first[0], second[0])
+        np.testing.assert_array_equal(first[1], second[1])
+
+    def test_different_seed_changes_split(self, imbalanced_target):
+        _, test_a = _stratified_split_indices(imbalanced_target, 0.2, random_state=7)
+        _, test_b = _stratified_split_indices(imbalanced_target, 0.2, random_state=8)
+
+        assert not np.array_equal(np.sort(test_a), np.sort(test_b))
+
+    def test_string_labels(self):
+        y = np.array(['no'] * 8 + ['yes'] * 2)
+
+        train_idx, test_idx = _stratified_split_indices(y, test_size=0.5, random_state=0)
+
+        assert sorted(y[test_idx]) == ['no'] * 4 + ['yes']
+        assert sorted(y[train_idx]) == ['no'] * 4 + ['yes']
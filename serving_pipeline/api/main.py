@@ -22,7 +22,12 @@ async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown"""
     # Startup
     logger.info("Starting Customer Churn Prediction API...")
-    logger.info("Model loaded successfully")
+    # Warm the model cache so the first request doesn't pay the download
+    try:
+        predict.get_model()
+        logger.info("Model loaded successfully")
+    except Exception as e:
+        logger.warning(f"Model warm-up failed, will retry on first request: {e}")
     logger.info("API ready to serve predictions")
     yield
     # Shutdown
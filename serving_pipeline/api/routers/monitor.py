@@ -21,8 +21,8 @@ logger = logging.getLogger(__name__)
 @router.get("/drift", response_model=DriftMetricsResponse)
 async def check_drift(
     format: str = Query("json", pattern="^(json|html)$", description="Output format: json or html"),
-    reference_path: Optional[str] = Query(None, description="Path to reference data CSV"),
-    current_path: Optional[str] = Query(None, description="Path to current/production data CSV"),
+    reference_path: Optional[str] = Query(None, description="Path to reference data (CSV or Parquet)"),
+    current_path: Optional[str] = Query(None, description="Path to current/production data (CSV or Parquet)"),
     days: int = Query(30, ge=1, le=365, description="Number of recent days for current data"),
     save_html: bool = Query(False, description="Save HTML report to file")
 ):
@@ -6,7 +6,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from api.schemas import ChurnInput, ChurnPrediction
-from pre_processing import validate_input, save_production_data, map_schema_to_preprocessing
+from pre_processing import validate_input, validate_input_batch, save_production_data, map_schema_to_preprocessing
 from load_model import load_model
 import logging
 import pandas as pd
@@ -43,15 +43,16 @@ async def predict_churn(data: ChurnInput, background_tasks: BackgroundTasks):
         input_data = data.model_dump()
         logger.info(f"Received input data: {input_data}")
         
+        # Map schema to model input format once (model has built-in preprocessing);
+        # validate_input skips its own mapping for already-mapped data
+        mapped_data = map_schema_to_preprocessing(input_data)
+        
         # Validate
-        is_valid, error_msg = validate_input(input_data)
+        is_valid, error_msg = validate_input(mapped_data)
         if not is_valid:
             logger.error(f"Validation failed: {error_msg}")
             raise HTTPException(status_code=422, detail=error_msg)
         
-        # Map schema to model input format (model has built-in preprocessing)
-        mapped_data = map_schema_to_preprocessing(input_data)
-        
         # Convert to DataFrame - model will handle preprocessing internally
         df_input = pd.DataFrame([mapped_data])
         
@@ -111,53 +112,55 @@ async def predict_batch(data_list: List[ChurnInput], background_tasks: Backgroun
         
         logger.info(f"Processing batch of {len(data_list)} customers")
         
-        results = []
+        # Invalid customers get a neutral prediction
+        results = [ChurnPrediction(churn=0) for _ in data_list]
+        valid_items = []
+        
+        input_records = [data.model_dump() for data in data_list]
+        valid_mask, error_msgs = validate_input_batch(input_records)
+        
+        for idx, input_data in enumerate(input_records):
+            if not valid_mask[idx]:
+                logger.warning(f"Validation failed for customer {idx}: {error_msgs[idx]}")
+                continue
+            valid_items.append((idx, input_data))
+        
         all_inputs = []
         
-        # Process all customers
-        for idx, data in enumerate(data_list):
+        if valid_items:
+            # Build the batch column-wise and predict it in a single model call
+            columns = {
+                field: [input_data[field] for _, input_data in valid_items]
+                for field in ChurnInput.model_fields
+            }
+            df_input = pd.DataFrame(map_schema_to_preprocessing(columns))
+            
+            # Convert numeric columns to float as required by model schema
+            float_columns = ['usage_frequency', 'payment_delay_days', 'total_spend']
+            df_input[float_columns] = df_input[float_columns].astype(float)
+            
+            # A model that cannot be loaded fails the request (500 below)
+            model = get_model()
             try:
-                input_data = data.model_dump()
-                
-                # Validate
-                is_valid, error_msg = validate_input(input_data)
-                if not is_valid:
-                    logger.warning(f"Validation failed for customer {idx}: {error_msg}")
-                    # Return neutral prediction for invalid data
-                    results.append(ChurnPrediction(
-                        churn=0
-                    ))
+                predictions = list(model.predict(df_input))
+            except Exception as e:
+                # Retry row by row so only the failing customers keep the
+                # neutral prediction
+                logger.error(f"Error predicting batch, retrying row by row: {str(e)}")
+                predictions = []
+                for row, (idx, _) in enumerate(valid_items):
+                    try:
+                        predictions.append(model.predict(df_input.iloc[[row]])[0])
+                    except Exception as row_error:
+                        logger.error(f"Error predicting customer {idx}: {str(row_error)}")
+                        predictions.append(None)
+            
+            for (idx, input_data), prediction in zip(valid_items, predictions):
+                if prediction is None:
                     continue
-                
-                # Map schema to model input format (model has built-in preprocessing)
-                mapped_data = map_schema_to_preprocessing(input_data)
-                
-                # Convert to DataFrame - model will handle preprocessing internally
-                df_input = pd.DataFrame([mapped_data])
-                
-                # Convert numeric columns to float as required by model schema
-                float_columns = ['usage_frequency', 'payment_delay_days', 'total_spend']
-                for col in float_columns:
-                    if col in df_input.columns:
-                        df_input[col] = df_input[col].astype(float)
-                
-                # Predict - model has built-in preprocessing
-                model = get_model()
-                prediction = model.predict(df_input)[0]
                 prediction_int = int(prediction)
-                
-                results.append(ChurnPrediction(
-                    churn=prediction_int
-                ))
-                
+                results[idx] = ChurnPrediction(churn=prediction_int)
                 all_inputs.append((input_data, prediction_int))
-                
-            except Exception as e:
-                logger.error(f"Error processing customer {idx}: {str(e)}")
-                # Return neutral prediction on error
-                results.append(ChurnPrediction(
-                    churn=0
-                ))
         
         # Save all to production data (background) - without probability
         for input_data, pred in all_inputs:
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Literal
 from typing import Optional
 
@@ -16,8 +16,10 @@ class ChurnInput(BaseModel):
     Total_Spend: float = Field(..., ge=100, le=1000, description="Total amount spent")
     Last_Interaction: int = Field(..., ge=1, le=30, description="Days since last interaction")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        extra='forbid',
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "Age": 30,
                 "Gender": "Female",
@@ -31,6 +33,7 @@ class ChurnInput(BaseModel):
                 "Last_Interaction": 17
             }
         }
+    )
 
 
 class ChurnPrediction(BaseModel):
@@ -241,12 +241,22 @@ def generate_drift_report(
     return metrics_dict
 
 
+def _read_monitoring_data(file_path: str) -> pd.DataFrame:
+    # Parquet (a file or a dataset directory) keeps native dtypes and skips
+    # text parsing; CSV is still accepted
+    if file_path.endswith('.parquet'):
+        return pd.read_parquet(file_path)
+    # pyarrow parses multithreaded; numeric columns keep the int64/float64
+    # dtypes generate_drift_report relies on to split numerical features
+    return pd.read_csv(file_path, engine="pyarrow")
+
+
 def load_reference_data(file_path: str = "data_model/reference/reference_data.csv") -> pd.DataFrame:
     """
     Load reference/baseline data for drift monitoring.
     
     Args:
-        file_path: Path to reference data CSV
+        file_path: Path to reference data (CSV or Parquet)
         
     Returns:
         DataFrame with reference data
@@ -257,7 +267,7 @@ def load_reference_data(file_path: str = "data_model/reference/reference_data.cs
         logger.error(f"Reference data file not found: {file_path}")
         raise FileNotFoundError(f"Reference data not found: {file_path}")
     
-    df = pd.read_csv(file_path)
+    df = _read_monitoring_data(file_path)
     logger.info(f"Loaded reference data: {df.shape}")
     
     # Convert timestamp to datetime if exists
@@ -269,14 +279,14 @@ def load_reference_data(file_path: str = "data_model/reference/reference_data.cs
 
 
 def load_current_data(
-    file_path: str = "data_model/production/production.csv",
+    file_path: str = "data_model/production/production.parquet",
     days: int = 30
 ) -> pd.DataFrame:
     """
     Load current production data for drift monitoring.
     
     Args:
-        file_path: Path to production data CSV
+        file_path: Path to production data (CSV, Parquet file or Parquet dataset directory)
         days: Number of recent days to include (default: 30)
         
     Returns:
@@ -284,11 +294,17 @@ def load_current_data(
     """
     logger.info(f"Loading current data from: {file_path} (last {days} days)")
     
+    # Before the first Parquet flush, fall back to the legacy production.csv
+    legacy_path = os.path.splitext(file_path)[0] + '.csv'
+    if file_path.endswith('.parquet') and not os.path.exists(file_path) and os.path.exists(legacy_path):
+        logger.info(f"Parquet production data not found, reading legacy CSV: {legacy_path}")
+        file_path = legacy_path
+    
     if not os.path.exists(file_path):
         logger.error(f"Production data file not found: {file_path}")
         raise FileNotFoundError(f"Production data not found: {file_path}")
     
-    df = pd.read_csv(file_path)
+    df = _read_monitoring_data(file_path)
     logger.info(f"Loaded production data: {df.shape}")
     
     # Convert timestamp to datetime and optionally filter by recent days
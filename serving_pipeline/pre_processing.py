@@ -1,11 +1,38 @@
-import pandas as pd
+import atexit
+import csv
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
 import numpy as np
-from typing import Dict, Any
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from typing import Dict, Any, NamedTuple
 
-# Mapping dictionaries
-GENDER_MAPPING = {'Male': 1, 'Female': 0}
-SUBSCRIPTION_MAPPING = {'Basic': 0, 'Standard': 1, 'Premium': 2}
-CONTRACT_MAPPING = {'Monthly': 0, 'Quarterly': 1, 'Annual': 2}
+logger = logging.getLogger(__name__)
+
+# Schema field names -> preprocessing field names
+SCHEMA_FIELD_MAPPING = {
+    'Age': 'age',
+    'Tenure': 'tenure_months',
+    'Usage_Frequency': 'usage_frequency',
+    'Support_Calls': 'support_calls',
+    'Payment_Delay': 'payment_delay_days',
+    'Total_Spend': 'total_spend',
+    'Last_Interaction': 'last_interaction_days',
+    'Gender': 'gender',
+    'Subscription_Type': 'subscription_type',
+    'Contract_Length': 'contract_length'
+}
+
+# (schema key, lowercased schema key, preprocessing key) for the mapping loop
+_SCHEMA_MAPPING_ITEMS = tuple(
+    (schema_key, schema_key.lower(), preprocess_key)
+    for schema_key, preprocess_key in SCHEMA_FIELD_MAPPING.items()
+)
 
 # Feature groups with NEW column names
 NUMERICAL_FEATURES = [
@@ -22,6 +49,87 @@ ENGINEERED_FEATURES = [
     'avg_monthly_spend'
 ]
 
+# Final model feature order, built once
+FEATURE_NAMES = (
+    tuple(NUMERICAL_FEATURES) +
+    ('gender_male', 'subscription_type_encoded', 'contract_length_encoded') +
+    tuple(ENGINEERED_FEATURES)
+)
+
+# Required fields (using preprocessing column names)
+REQUIRED_FIELDS = (
+    'age', 'gender', 'tenure_months', 'usage_frequency',
+    'support_calls', 'payment_delay_days', 'subscription_type',
+    'contract_length', 'total_spend', 'last_interaction_days'
+)
+
+_REQUIRED_SET = frozenset(REQUIRED_FIELDS)
+
+# (field, min, max) for numerical fields
+RANGE_VALIDATIONS = (
+    ('age', 18, 100),
+    ('tenure_months', 0, 72),
+    ('usage_frequency', 0, 30),
+    ('support_calls', 0, 20),
+    ('payment_delay_days', 0, 60),
+    ('total_spend', 0, 10000),
+    ('last_interaction_days', 0, 365)
+)
+
+# Column-wise bounds for batch validation (float64 keeps the limits exact)
+_RANGE_FIELDS = tuple(field for field, _, _ in RANGE_VALIDATIONS)
+_RANGE_MINS = np.array([min_val for _, min_val, _ in RANGE_VALIDATIONS], dtype=np.float64)
+_RANGE_MAXS = np.array([max_val for _, _, max_val in RANGE_VALIDATIONS], dtype=np.float64)
+
+# field -> (allowed values, error message) for categorical fields
+CATEGORICAL_VALIDATIONS = {
+    'gender': (
+        frozenset({'Male', 'Female', 'male', 'female'}),
+        "gender must be 'Male' or 'Female'"
+    ),
+    'subscription_type': (
+        frozenset({'Basic', 'Standard', 'Premium', 'basic', 'standard', 'premium'}),
+        "subscription_type must be 'Basic', 'Standard', or 'Premium'"
+    ),
+    'contract_length': (
+        frozenset({'Monthly', 'Quarterly', 'Annual', 'monthly', 'quarterly', 'annual'}),
+        "contract_length must be 'Monthly', 'Quarterly', or 'Annual'"
+    ),
+}
+
+class ProductionRecord(NamedTuple):
+    """One logged prediction; fields are the production data columns"""
+    Age: int
+    Gender: str
+    Tenure: int
+    Usage_Frequency: int
+    Support_Calls: int
+    Payment_Delay: int
+    Subscription_Type: str
+    Contract_Length: str
+    Total_Spend: float
+    Last_Interaction: int
+    prediction: int
+
+
+# Arrow schema of the production data files, derived from ProductionRecord
+PRODUCTION_SCHEMA = pa.schema([
+    (name, {int: pa.int64(), float: pa.float64(), str: pa.string()}[field_type])
+    for name, field_type in ProductionRecord.__annotations__.items()
+])
+
+# Production records are buffered and appended to disk in batches; the
+# thresholds keep Parquet part files from holding only a handful of rows
+PRODUCTION_FLUSH_SIZE = 1000
+PRODUCTION_FLUSH_INTERVAL = 300.0  # seconds
+_PROD_BUFFER: deque = deque()
+_PROD_LOCK = threading.Lock()
+_PROD_FLUSH_TIMER: threading.Timer | None = None
+# Paths already created on disk (guarded by _PROD_LOCK); skips makedirs/exists
+_PROD_READY_PATHS: set = set()
+# Records saved per path (on disk at first use plus everything saved since)
+_PROD_COUNTS: Dict[str, int] = {}
+
 
 def map_schema_to_preprocessing(data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -33,34 +141,79 @@ def map_schema_to_preprocessing(data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dictionary with preprocessing field names (age, tenure_months, etc.)
     """
-    mapping = {
-        'Age': 'age',
-        'Tenure': 'tenure_months',
-        'Usage_Frequency': 'usage_frequency',
-        'Support_Calls': 'support_calls',
-        'Payment_Delay': 'payment_delay_days',
-        'Total_Spend': 'total_spend',
-        'Last_Interaction': 'last_interaction_days',
-        'Gender': 'gender',
-        'Subscription_Type': 'subscription_type',
-        'Contract_Length': 'contract_length'
-    }
+    # Already in preprocessing format: copy through without case folding
+    if (
+        all(key in data for key in SCHEMA_FIELD_MAPPING.values())
+        and not any(key in data for key in SCHEMA_FIELD_MAPPING)
+    ):
+        return {key: data[key] for key in SCHEMA_FIELD_MAPPING.values()}
     
-    # Convert to lowercase keys for case-insensitive matching
-    data_lower = {k.lower(): v for k, v in data.items()}
     mapped_data = {}
+    data_lower = None
     
-    for schema_key, preprocess_key in mapping.items():
+    for schema_key, schema_key_lower, preprocess_key in _SCHEMA_MAPPING_ITEMS:
         # Try exact match first, then case-insensitive
         if schema_key in data:
             mapped_data[preprocess_key] = data[schema_key]
-        elif schema_key.lower() in data_lower:
-            mapped_data[preprocess_key] = data_lower[schema_key.lower()]
+            continue
+        if data_lower is None:
+            # Lowercase keys are only needed once an exact match misses
+            data_lower = {k.lower(): v for k, v in data.items()}
+        if schema_key_lower in data_lower:
+            mapped_data[preprocess_key] = data_lower[schema_key_lower]
         elif preprocess_key in data:
             # Already in correct format
             mapped_data[preprocess_key] = data[preprocess_key]
     
     return mapped_data
+
+
+def _is_schema_format(data: Dict[str, Any]) -> bool:
+    # Requests use one naming style throughout, so the first key decides
+    first_key = next(iter(data), '')
+    return first_key[:1].isupper()
+
+
+def _build_validator():
+    """
+    Compile the checks from RANGE_VALIDATIONS and CATEGORICAL_VALIDATIONS
+    into one straight-line function, so a call does no table lookups
+    """
+    lines = [
+        "def _validate_mapped(data):",
+        # One C-level subset test; the missing fields are only collected on failure
+        "    if not data.keys() >= _REQUIRED_SET:",
+        "        missing = _REQUIRED_SET.difference(data)",
+        "        missing_fields = [f for f in REQUIRED_FIELDS if f in missing]",
+        "        return False, f\"Missing required fields: {', '.join(missing_fields)}\"",
+    ]
+    for field, min_val, max_val in RANGE_VALIDATIONS:
+        lines += [
+            f"    value = data.get({field!r})",
+            "    if value is not None:",
+            "        if not isinstance(value, (int, float)):",
+            f"            return False, {f'{field} must be a number'!r}",
+            f"        if not ({min_val!r} <= value <= {max_val!r}):",
+            f"            return False, {f'{field} must be between {min_val} and {max_val}'!r}",
+        ]
+    for field, (allowed, error_msg) in CATEGORICAL_VALIDATIONS.items():
+        allowed_literal = "{" + ", ".join(repr(v) for v in sorted(allowed)) + "}"
+        lines += [
+            f"    value = data.get({field!r})",
+            f"    if not isinstance(value, str) or value not in {allowed_literal}:",
+            f"        return False, {error_msg!r}",
+        ]
+    lines.append("    return True, ''")
+    
+    namespace = {'REQUIRED_FIELDS': REQUIRED_FIELDS, '_REQUIRED_SET': _REQUIRED_SET}
+    exec(compile("\n".join(lines), '<validator>', 'exec'), namespace)
+    return namespace['_validate_mapped']
+
+
+# Checks input already in preprocessing format; returns (is_valid, error_message)
+_validate_mapped = _build_validator()
+
+
 def validate_input(data: Dict[str, Any]) -> tuple[bool, str]:
     """
     Validate input data (supports both schema and preprocessing formats)
@@ -72,112 +225,203 @@ def validate_input(data: Dict[str, Any]) -> tuple[bool, str]:
         (is_valid, error_message)
     """
     # Map schema to preprocessing format for validation
-    if any(key[0].isupper() for key in data.keys()):  # Schema format detected
+    if _is_schema_format(data):
         data = map_schema_to_preprocessing(data)
     
-    # Required fields (using preprocessing column names)
-    required_fields = [
-        'age', 'gender', 'tenure_months', 'usage_frequency',
-        'support_calls', 'payment_delay_days', 'subscription_type',
-        'contract_length', 'total_spend', 'last_interaction_days'
-    ]
+    return _validate_mapped(data)
+
+def _category_value(value: Any) -> Any:
+    # Non-strings (possibly unhashable) never match an allowed value
+    return value if isinstance(value, str) else None
+
+
+def validate_input_batch(records: list) -> tuple[np.ndarray, list]:
+    """
+    Validate a batch of input records with column-wise checks
     
-    # Check missing fields
-    missing_fields = [f for f in required_fields if f not in data]
-    if missing_fields:
-        return False, f"Missing required fields: {', '.join(missing_fields)}"
-    
-    # Validate ranges
-    validations = [
-        ('age', 18, 100),
-        ('tenure_months', 0, 72),
-        ('usage_frequency', 0, 30),
-        ('support_calls', 0, 20),
-        ('payment_delay_days', 0, 60),
-        ('total_spend', 0, 10000),
-        ('last_interaction_days', 0, 365)
+    Args:
+        records: List of dictionaries (schema or preprocessing format)
+        
+    Returns:
+        (valid_mask, error_messages) with one entry per record; messages are
+        the same as validate_input and empty for valid records
+    """
+    mapped = [
+        map_schema_to_preprocessing(data) if _is_schema_format(data) else data
+        for data in records
     ]
     
-    for field, min_val, max_val in validations:
-        value = data.get(field)
-        if value is None:
-            continue
-        if not isinstance(value, (int, float)):
-            return False, f"{field} must be a number"
-        if not (min_val <= value <= max_val):
-            return False, f"{field} must be between {min_val} and {max_val}"
+    # Missing or non-numeric values leave an object/str array: validate row by row
+    try:
+        numeric = np.array([[data.get(field) for field in _RANGE_FIELDS] for data in mapped])
+    except ValueError:
+        numeric = None
+    if len(mapped) == 0 or numeric is None or numeric.dtype.kind not in 'biuf':
+        results = [validate_input(data) for data in mapped]
+        return np.array([ok for ok, _ in results], dtype=bool), [msg for _, msg in results]
     
-    # Validate categorical fields
-    gender = data.get('gender')
-    if gender not in ['Male', 'Female', 'male', 'female']:
-        return False, "gender must be 'Male' or 'Female'"
+    valid = ((numeric >= _RANGE_MINS) & (numeric <= _RANGE_MAXS)).all(axis=1)
+    for field, (allowed, _) in CATEGORICAL_VALIDATIONS.items():
+        values = np.array(
+            [_category_value(data.get(field)) for data in mapped],
+            dtype=object,
+        )
+        valid &= np.isin(values, list(allowed))
     
-    subscription_type = data.get('subscription_type')
-    if subscription_type not in ['Basic', 'Standard', 'Premium', 'basic', 'standard', 'premium']:
-        return False, "subscription_type must be 'Basic', 'Standard', or 'Premium'"
+    # Only failing records pay for building the exact error message
+    errors = ["" if ok else validate_input(data)[1] for ok, data in zip(valid, mapped)]
+    return valid, errors
+
+
+def _append_production_records(production_file: str, records: list[ProductionRecord]):
+    # Called with _PROD_LOCK held
+    ready = production_file in _PROD_READY_PATHS
+    if production_file.endswith('.csv'):
+        # Append only the new rows; the header is written when the file is created
+        if not ready:
+            os.makedirs(os.path.dirname(production_file), exist_ok=True)
+        write_header = not ready and not os.path.exists(production_file)
+        with open(production_file, 'a', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            if write_header:
+                writer.writerow(ProductionRecord._fields)
+            writer.writerows(records)
+    else:
+        # Parquet dataset directory: each flush adds one part file, nothing is read back
+        if not ready:
+            os.makedirs(production_file, exist_ok=True)
+        part_file = os.path.join(
+            production_file, f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+        )
+        columns = [list(column) for column in zip(*records)]
+        pq.write_table(pa.table(columns, schema=PRODUCTION_SCHEMA), part_file)
+    _PROD_READY_PATHS.add(production_file)
+
+
+def _migrate_legacy_csv(production_file: str):
+    """
+    Import the old production.csv next to a new Parquet dataset directory
+
+    Runs once, when the dataset does not exist yet; the CSV is left in place.
+    """
+    legacy_file = os.path.splitext(production_file)[0] + '.csv'
+    if (
+        production_file.endswith('.csv')
+        or os.path.exists(production_file)
+        or not os.path.exists(legacy_file)
+    ):
+        return
     
-    contract_length = data.get('contract_length')
-    if contract_length not in ['Monthly', 'Quarterly', 'Annual', 'monthly', 'quarterly', 'annual']:
-        return False, "contract_length must be 'Monthly', 'Quarterly', or 'Annual'"
+    try:
+        table = pacsv.read_csv(
+            legacy_file,
+            convert_options=pacsv.ConvertOptions(
+                column_types=PRODUCTION_SCHEMA,
+                include_columns=PRODUCTION_SCHEMA.names,
+            ),
+        )
+    except (pa.ArrowInvalid, KeyError) as e:
+        logger.warning("Could not migrate legacy production data %s: %s", legacy_file, e)
+        return
     
-    return True, ""
+    os.makedirs(production_file, exist_ok=True)
+    pq.write_table(table, os.path.join(production_file, "part-0-legacy.parquet"))
+    logger.info(
+        "Migrated %d legacy production records from %s", table.num_rows, legacy_file
+    )
+
+
+def _count_production_records(production_file: str) -> int:
+    if production_file not in _PROD_READY_PATHS and not os.path.exists(production_file):
+        return 0
+    if production_file.endswith('.csv'):
+        # Count raw lines without parsing the CSV
+        with open(production_file, 'rb') as f:
+            return sum(1 for _ in f) - 1
+    # Row counts come from the Parquet footers
+    return sum(
+        pq.read_metadata(os.path.join(production_file, name)).num_rows
+        for name in os.listdir(production_file)
+        if name.endswith('.parquet')
+    )
+
+
+def flush_production_data():
+    """
+    Write all buffered production records to disk
+    """
+    global _PROD_FLUSH_TIMER
+    with _PROD_LOCK:
+        if _PROD_FLUSH_TIMER is not None:
+            _PROD_FLUSH_TIMER.cancel()
+            _PROD_FLUSH_TIMER = None
+        
+        records_by_file = {}
+        while _PROD_BUFFER:
+            production_file, record = _PROD_BUFFER.popleft()
+            records_by_file.setdefault(production_file, []).append(record)
+        
+        for production_file, records in records_by_file.items():
+            _append_production_records(production_file, records)
+
+
+atexit.register(flush_production_data)
+
 
 def save_production_data(data: Dict[str, Any], prediction: int, 
                         production_file: str = None):
     """
     Save prediction to production dataset for drift monitoring
     
+    Records are buffered and written every PRODUCTION_FLUSH_SIZE records or
+    PRODUCTION_FLUSH_INTERVAL seconds, whichever comes first.
+    
     Args:
-        data: Input data dictionary
+        data: Input data dictionary in schema format (ChurnInput fields)
         prediction: Model prediction (0 or 1)
-        production_file: Path to save production data 
+        production_file: Parquet dataset directory (default) or a .csv file
     """
-    import os
+    global _PROD_FLUSH_TIMER
     
     # Set default path relative to serving_pipeline directory
     if production_file is None:
         # Get the directory where this file is located
         current_dir = os.path.dirname(os.path.abspath(__file__))
-        production_file = os.path.join(current_dir, "data_model", "production", "production.csv")
+        production_file = os.path.join(current_dir, "data_model", "production", "production.parquet")
     
-    # Add metadata
-    record = data.copy()
-    record['prediction'] = prediction
+    record = ProductionRecord(**data, prediction=prediction)
     
-    # Create DataFrame
-    df_new = pd.DataFrame([record])
-    
-    # Append to file
-    if os.path.exists(production_file):
-        df_existing = pd.read_csv(production_file)
-        df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-    else:
-        df_combined = df_new
+    with _PROD_LOCK:
+        if production_file not in _PROD_COUNTS:
+            _migrate_legacy_csv(production_file)
+            _PROD_COUNTS[production_file] = _count_production_records(production_file)
+        _PROD_COUNTS[production_file] += 1
+        total_records = _PROD_COUNTS[production_file]
+        
+        _PROD_BUFFER.append((production_file, record))
+        flush_now = len(_PROD_BUFFER) >= PRODUCTION_FLUSH_SIZE
+        if not flush_now and _PROD_FLUSH_TIMER is None:
+            _PROD_FLUSH_TIMER = threading.Timer(PRODUCTION_FLUSH_INTERVAL, flush_production_data)
+            _PROD_FLUSH_TIMER.daemon = True
+            _PROD_FLUSH_TIMER.start()
     
-    # Save
-    os.makedirs(os.path.dirname(production_file), exist_ok=True)
-    df_combined.to_csv(production_file, index=False)
+    if flush_now:
+        flush_production_data()
     
     # Log for debugging
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.info(f"Saved production data to: {production_file} (Total records: {len(df_combined)})")
+    logger.info("Saved production data to: %s (Total records: %d)", production_file, total_records)
     
-    return len(df_combined)
+    return total_records
 
 
-def get_feature_names() -> list:
+def get_feature_names() -> tuple:
     """
     Get final feature names for model training
     
     Returns:
-        List of feature names
+        Tuple of feature names (shared, read-only)
     """
-    return (
-        NUMERICAL_FEATURES + 
-        ['gender_male', 'subscription_type_encoded', 'contract_length_encoded'] +
-        ENGINEERED_FEATURES
-    )
+    return FEATURE_NAMES
 
 
 # Example usage and testing
@@ -202,10 +446,5 @@ if __name__ == "__main__":
     if not is_valid:
         print(f"Error: {error_msg}")
     
-    # Preprocess
-    df_processed = preprocess_input(sample_data)
-    print(f"\nProcessed features: {df_processed.columns.tolist()}")
-    print(f"\nProcessed data:\n{df_processed}")
-    
     # Get feature names
     print(f"\nExpected features for model: {get_feature_names()}")
\ No newline at end of file
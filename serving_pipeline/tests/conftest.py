@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Serving modules are imported top-level (e.g. `import pre_processing`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
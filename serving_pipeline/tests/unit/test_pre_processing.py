@@ -0,0 +1,178 @@
+import os
+
+import pandas as pd
+import pytest
+
+import pre_processing
+from pre_processing import (
+    flush_production_data,
+    save_production_data,
+    validate_input,
+    validate_input_batch,
+)
+
+
+VALID_SCHEMA_RECORD = {
+    'Age': 35,
+    'Gender': 'Male',
+    'Tenure': 24,
+    'Usage_Frequency': 15,
+    'Support_Calls': 3,
+    'Payment_Delay': 5,
+    'Subscription_Type': 'Premium',
+    'Contract_Length': 'Annual',
+    'Total_Spend': 1200.5,
+    'Last_Interaction': 10,
+}
+
+VALID_PREPROCESSING_RECORD = {
+    'age': 42,
+    'gender': 'female',
+    'tenure_months': 12,
+    'usage_frequency': 8,
+    'support_calls': 1,
+    'payment_delay_days': 0,
+    'subscription_type': 'basic',
+    'contract_length': 'monthly',
+    'total_spend': 300.0,
+    'last_interaction_days': 2,
+}
+
+
+def _with(record, **changes):
+    updated = dict(record)
+    for key, value in changes.items():
+        if value is None:
+            updated.pop(key, None)
+        else:
+            updated[key] = value
+    return updated
+
+
+BATCH_RECORDS = [
+    VALID_SCHEMA_RECORD,
+    VALID_PREPROCESSING_RECORD,
+    _with(VALID_SCHEMA_RECORD, Age=17),
+    _with(VALID_SCHEMA_RECORD, Total_Spend=-1.0),
+    _with(VALID_SCHEMA_RECORD, Gender='Other'),
+    _with(VALID_SCHEMA_RECORD, Subscription_Type='PREMIUM'),
+    _with(VALID_SCHEMA_RECORD, Tenure=None),
+    _with(VALID_PREPROCESSING_RECORD, age=None, contract_length=None),
+    _with(VALID_PREPROCESSING_RECORD, support_calls='many'),
+    _with(VALID_PREPROCESSING_RECORD, contract_length='weekly'),
+]
+
+
+class TestValidateInputBatch:
+
+    def test_matches_per_record_validation(self):
+        valid_mask, messages = validate_input_batch(BATCH_RECORDS)
+
+        expected = [validate_input(record) for record in BATCH_RECORDS]
+        assert list(valid_mask) == [is_valid for is_valid, _ in expected]
+        assert messages == [message for _, message in expected]
+
+    def test_all_valid_batch(self):
+        records = [VALID_SCHEMA_RECORD, VALID_PREPROCESSING_RECORD] * 3
+
+        valid_mask, messages = validate_input_batch(records)
+
+        assert valid_mask.all()
+        assert messages == [''] * len(records)
+
+    def test_mixed_batch_falls_back_to_per_record_messages(self):
+        records = [VALID_SCHEMA_RECORD, _with(VALID_SCHEMA_RECORD, Age=None)]
+
+        valid_mask, messages = validate_input_batch(records)
+
+        assert list(valid_mask) == [True, False]
+        assert messages[1] == validate_input(records[1])[1]
+
+
+@pytest.fixture
+def production_buffer(monkeypatch):
+    """Isolate the module-level production buffer and flush every 3 records"""
+    monkeypatch.setattr(pre_processing, 'PRODUCTION_FLUSH_SIZE', 3)
+    monkeypatch.setattr(pre_processing, 'PRODUCTION_FLUSH_INTERVAL', 3600.0)
+    monkeypatch.setattr(pre_processing, '_PROD_COUNTS', {})
+    monkeypatch.setattr(pre_processing, '_PROD_READY_PATHS', set())
+    yield
+    flush_production_data()
+
+
+class TestSaveProductionData:
+
+    def test_buffers_until_flush_size(self, production_buffer, tmp_path):
+        production_file = str(tmp_path / "production.parquet")
+
+        assert save_production_data(VALID_SCHEMA_RECORD, 0, production_file) == 1
+        assert save_production_data(VALID_SCHEMA_RECORD, 1, production_file) == 2
+        assert not os.path.exists(production_file)
+
+        assert save_production_data(VALID_SCHEMA_RECORD, 1, production_file) == 3
+        assert len(pd.read_parquet(production_file)) == 3
+
+    def test_flush_writes_remaining_records(self, production_buffer, tmp_path):
+        production_file = str(tmp_path / "production.parquet")
+
+        for prediction in (0, 1, 0, 1):
+            save_production_data(VALID_SCHEMA_RECORD, prediction, production_file)
+        flush_production_data()
+
+        df = pd.read_parquet(production_file)
+        assert len(df) == 4
+        assert len(os.listdir(production_file)) == 2
+
+    def test_parquet_dataset_round_trip(self, production_buffer, tmp_path):
+        production_file = str(tmp_path / "production.parquet")
+        records = [
+            _with(VALID_SCHEMA_RECORD, Age=30 + i, Total_Spend=100.0 * i)
+            for i in range(5)
+        ]
+
+        for i, record in enumerate(records):
+            save_production_data(record, i % 2, production_file)
+        flush_production_data()
+
+        df = pd.read_parquet(production_file).sort_values('Age', ignore_index=True)
+        assert list(df.columns) == list(pre_processing.PRODUCTION_SCHEMA.names)
+        assert df['Age'].tolist() == [30, 31, 32, 33, 34]
+        assert df['Total_Spend'].tolist() == [0.0, 100.0, 200.0, 300.0, 400.0]
+        assert df['prediction'].tolist() == [0, 1, 0, 1, 0]
+        assert (df['Gender'] == 'Male').all()
+
+    def test_count_continues_from_existing_dataset(self, production_buffer, tmp_path):
+        production_file = str(tmp_path / "production.parquet")
+        for _ in range(3):
+            save_production_data(VALID_SCHEMA_RECORD, 0, production_file)
+
+        # A new process starts counting from the records already on disk
+        pre_processing._PROD_COUNTS.clear()
+        pre_processing._PROD_READY_PATHS.clear()
+
+        assert save_production_data(VALID_SCHEMA_RECORD, 1, production_file) == 4
+
+    def test_csv_file_gets_a_single_header(self, production_buffer, tmp_path):
+        production_file = str(tmp_path / "production.csv")
+
+        for prediction in (0, 1, 0, 1):
+            save_production_data(VALID_SCHEMA_RECORD, prediction, production_file)
+        flush_production_data()
+
+        df = pd.read_csv(production_file)
+        assert list(df.columns) == list(pre_processing.ProductionRecord._fields)
+        assert df['prediction'].tolist() == [0, 1, 0, 1]
+
+    def test_migrates_legacy_csv(self, production_buffer, tmp_path):
+        legacy_file = tmp_path / "production.csv"
+        pd.DataFrame([dict(VALID_SCHEMA_RECORD, prediction=1)] * 2).to_csv(
+            legacy_file, index=False
+        )
+        production_file = str(tmp_path / "production.parquet")
+
+        assert save_production_data(VALID_SCHEMA_RECORD, 0, production_file) == 3
+        flush_production_data()
+
+        df = pd.read_parquet(production_file)
+        assert sorted(df['prediction'].tolist()) == [0, 1, 1]
+        assert legacy_file.exists()